@@ -7,6 +7,7 @@ import click
 from src.view.bk_view import BKView
 from src.model.bk_tree import BKTree, read_from_pkl
 from src.controller.bk_controller import BKController
+from src.model.normalizer import Normalizer
 
 
 class PickleError(Exception):
@@ -34,7 +35,17 @@ def notify_tree_instantiation(word_list_length):
 @click.option("-m", "--metric", default='levenshtein', )
 # boolean option for visualization in new window
 @click.option('--vis/--no-vis', default=True)
-def main(pickle, path, metric, vis):
+# number of tree levels exported to .dot/.svg
+@click.option("-ed", "--export-depth", type=click.IntRange(min=0))
+# normalization options applied to the word list and query words
+@click.option("-nf", "--norm-form", default="NFC",
+              type=click.Choice(Normalizer.forms))
+@click.option("--casefold/--no-casefold", default=False)
+@click.option("--strip-accents/--keep-accents", default=False)
+# boolean option for sampling the number of visited nodes per distance
+@click.option("--estimate/--no-estimate", default=False)
+def main(pickle, path, metric, vis, export_depth, norm_form, casefold,
+         strip_accents, estimate):
     """
     Provides a terminal interface and interactive mode for
     the (re)-construction, graphical visualization, and near-matches
@@ -52,6 +63,19 @@ def main(pickle, path, metric, vis):
     is being presented to the user.
     By default, the boolean is true (= --vis) and can be omitted if a
     visualization is desired.
+    @param export_depth: Optional number of levels below the root that
+    are exported to .dot/.svg in src/model/output. Unlike --vis, this
+    also works for large trees.
+    @param norm_form: Unicode normalization form applied to every word
+    and query word (NFC by default).
+    @param casefold: Boolean flag that determines if words are
+    case-folded. By default, case is preserved (= --no-casefold).
+    @param strip_accents: Boolean flag that determines if accents are
+    removed from words. By default, they are kept (= --keep-accents).
+    @param estimate: Boolean flag that determines if the share of nodes
+    visited per search distance is estimated and shown along with the
+    tree specifications. The estimate runs sample searches, hence it is
+    disabled by default (= --no-estimate).
     """
     # Case 1: recreate BKTree object from .pkl
     if pickle:
@@ -70,15 +94,18 @@ def main(pickle, path, metric, vis):
         # notify user of BKTree instantiation
         print(notify_tree_instantiation(len(word_list)))
         # instantiate model
-        model = BKTree(word_list, dist_func=metric)
+        normalizer = Normalizer(norm_form, casefold, strip_accents)
+        model = BKTree(word_list, dist_func=metric, normalizer=normalizer)
         # do not visualize in new plotting window if more than 5000 words
+        # the top levels can be exported via --export-depth instead
         if len(word_list) > 5000:
             vis = False
     view = BKView()
     # create controller by combining MVC components
     controller = BKController(model, view)
     # start terminal programm/interactive mode with/without visualization
-    controller.start_view(visualize=vis)
+    controller.start_view(visualize=vis, export_depth=export_depth,
+                          estimate=estimate)
 
 
 if __name__ == '__main__':
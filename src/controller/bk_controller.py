@@ -4,6 +4,7 @@
 # Windows 11
 
 import sys
+import unicodedata
 from src.model.bk_tree import BKTree
 from src.view.bk_view import BKView
 
@@ -42,25 +43,41 @@ class BKController:
         """
         return self.__view
 
-    def start_view(self, visualize=False):
+    def start_view(self, visualize=False, export_depth=None,
+                   estimate=False):
         """
         Starts the view that presents the model output and
         obtains the user input. It comprises the presentation
         of the tree's specifications and its visualization
-        (if visualize is set to True) and sets off the
+        (if visualize is set to True) and/or the export of its top
+        levels to .dot/.svg (if export_depth is given), and sets off the
         interactive mode in the terminal.
         @param visualize: Boolean determining if the view will
         visualize the BKTree.
+        @param export_depth: Optional number of levels (int) below the root
+        to be exported, suited for trees too large to be visualized.
+        @param estimate: Boolean determining if the share of nodes visited
+        per search distance is estimated (runs sample searches).
         """
         # show tree specifications to user (tree depth, root word,
-        # and number of words/nodes in the tree)
+        # number of words/nodes in the tree, tree statistics, and
+        # estimated share of visited nodes per search distance if desired)
         depth = self.model.tree_depth
         root = self.model.root
         num_words = self.model.num_of_words
-        self.view.get_tree_specs(root, num_words, depth)
+        stats = self.model.tree_stats
+        visited = {d: self.model.estimate_visited_fraction(d)
+                   for d in range(4)} if estimate else None
+        self.view.get_tree_specs(root, num_words, depth, stats, visited,
+                                 self.model.scan_threshold)
         # visualize graph (new window)
         if visualize:
             self.view.visualize(self.model.graph)
+        # export top levels of the tree without building up a graph
+        if export_depth is not None:
+            path = f"src/model/output/{root}_top_{export_depth}.dot"
+            self.model.export_dot(path, max_depth=export_depth)
+            self.view.render_svg(path)
 
         # start interactive mode in terminal
         self.__interactive_mode()
@@ -85,7 +102,9 @@ class BKController:
             # if query word is not alphabetic (must not be a numeric string)
             # or not a blank line, loop until user provides a correct input
             # isalpha assures that query word is a single word
-            while not query_word.isalpha() and query_word != "":
+            # check the query word as the model normalizes it, composed
+            # (NFC) so that combining accents are not rejected
+            while not self.__is_alphabetic(query_word) and query_word != "":
                 error = "Error: Query word must be an alphabetic string" \
                         " without numbers/special characters, " \
                         "i.e. a single word."
@@ -115,3 +134,13 @@ class BKController:
             result = self.model.search(query_word, distance)
             # print result(s) as joined string rather than a list
             self.view.print_search_results(result)
+
+    def __is_alphabetic(self, query_word):
+        """
+        Checks if the query word is alphabetic after the model's
+        normalization, composing characters and combining accents.
+        @param query_word: Query word as str.
+        @return: Boolean.
+        """
+        return unicodedata.normalize(
+            "NFC", self.model.normalize(query_word)).isalpha()
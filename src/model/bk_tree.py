@@ -6,9 +6,17 @@
 import pickle
 import random
 import os
+import zlib
+from collections import deque
+from time import perf_counter
+import numpy as np
 import networkx as nx
-from networkx.drawing.nx_pydot import write_dot
-from src.model.metrics.metrics import all_metrics, MetricError
+from src.model.metrics.metrics import all_metrics, bounded_metrics, \
+    MetricError
+from src.model.distance_cache import DistanceCache
+from src.model.tree_stats import TreeStats
+from src.model.normalizer import Normalizer
+from src.model.linear_scan import linear_scan, to_scan_list
 from datetime import datetime
 
 
@@ -39,7 +47,11 @@ class BKTree:
     and triangle inequality (e.g. levenshtein distance).
     """
 
-    def __init__(self, word_list, dist_func):
+    # available search paths, "auto" lets the query planner decide
+    search_paths = ("tree", "scan")
+
+    def __init__(self, word_list, dist_func, cache=None, normalizer=None,
+                 root=None):
         """
         Instantiates a BKTree object from the provided word list and
         distance function.
@@ -49,14 +61,52 @@ class BKTree:
         distance between two words. The string is searched for in the
         all_metrics dict (defined in metrics.py) that contains the function
         name (key) and callable function (value) of every metric.
+        @param cache: Optional memo cache for the computed distances, either
+        the maximum number of cached distances (int) or a DistanceCache
+        instance of the same metric, e.g. taken from a previous tree to
+        speed up a rebuild. For rebuilds, the cache should hold all
+        insertion distances (roughly number of words * mean node depth).
+        By default, no distances are cached.
+        @param normalizer: Optional Normalizer that maps every word and
+        search word to a normalized key. The tree is built up from the
+        keys, the search results are the original words (surface forms).
+        By default, words are used as they are.
+        @param root: Optional word of the word list used as root word.
+        By default, the root of the tree the given DistanceCache was used
+        for last is reused if it is still in the word list (so that most
+        insertion distances are found in the cache), otherwise the root
+        word is chosen randomly.
         """
         assert isinstance(word_list, list), \
             "Attribute 'word_list' must be a list."
+        assert normalizer is None or isinstance(normalizer, Normalizer), \
+            "Attribute 'normalizer' must be a Normalizer instance."
         # assure that every element in the word list is a single word/string
         # and raise error if not
         self.__check_list_integrity(word_list)
+        self.__normalizer = normalizer
+        # normalized key : original surface forms
+        # only keys whose surface forms differ from the key itself are
+        # stored to save memory
+        self.__surface_forms = dict()
+        if normalizer is not None:
+            # every word is normalized exactly once
+            for word in dict.fromkeys(word_list):
+                self.__surface_forms.setdefault(normalizer(word),
+                                                []).append(word)
+            word_list = list(self.__surface_forms)
+            # normalization may turn a word into an empty string or
+            # several words, check the keys, too
+            self.__check_list_integrity(word_list)
+            self.__surface_forms = {key: forms for key, forms
+                                    in self.__surface_forms.items()
+                                    if forms != [key]}
         # make sure that every word is unique
-        self.__word_list = list(set(word_list))
+        # words are inserted in a pseudo-random but fixed order (by
+        # checksum), so that a rebuild after small vocabulary changes
+        # repeats most insertions and finds their distances in the cache
+        self.__word_list = sorted(set(word_list), key=lambda word:
+                                  zlib.crc32(word.encode("utf-8")))
         # check if dist_func is valid
         # all_metrics dict structure = function_name : function (callable)
         if dist_func not in all_metrics:
@@ -65,35 +115,80 @@ class BKTree:
                               f"{', '.join(all_metrics.keys())}.")
         # store attribute as a callable function
         self.__dist_func = all_metrics[dist_func]
-
-        # get randon number to determine root word
-        n = random.randint(0, self.num_of_words - 1)
-        self.__root_word = self.__word_list[n]
+        # bounded version of the metric used in the search, it stops
+        # computing once the distance cannot be relevant anymore
+        self.__bounded_dist_func = bounded_metrics[dist_func]
+        # distance cache shared by the construction and every search
+        if cache is None or isinstance(cache, DistanceCache):
+            self.__cache = cache
+        else:
+            self.__cache = DistanceCache(self.__dist_func,
+                                         self.__bounded_dist_func, cache)
+        if self.__cache is not None \
+                and self.__cache.metric_name != dist_func:
+            raise MetricError(f"Distance cache of metric "
+                              f"{self.__cache.metric_name} cannot be used "
+                              f"with {dist_func}.")
+
+        # determine root word: given root, root of the cache's previous
+        # tree, or random word
+        if root is not None:
+            root = self.normalize(root)
+            if root not in self.__word_list:
+                raise ListIntegrityError("Root word must be part of the"
+                                         " word list")
+            self.__root_word = root
+        elif self.__cache is not None and self.__cache.root is not None \
+                and self.__cache.root in self.__word_list:
+            self.__root_word = self.__cache.root
+        else:
+            # get randon number to determine root word
+            n = random.randint(0, self.num_of_words - 1)
+            self.__root_word = self.__word_list[n]
+        if self.__cache is not None:
+            self.__cache.root = self.__root_word
+            # vocabulary keeps its IDs, query words may be forgotten
+            self.__cache.pin(self.__word_list)
 
         # recursive tuple representation (word-labeled node, child dict)
         # dict keys represent the levenshtein/lsc distance mapping
         # to other subtrees that in turn are recursive 2-tuples, too
         self.__tree = (self.__root_word, dict())
 
-        # lay basis for graph/graphical visualization
-        self.__graph = nx.DiGraph()
+        # graph for the graphical visualization, it is only built up
+        # (from the tuple representation) when it is accessed, since it
+        # needs far more memory than the tree itself
+        self.__graph = None
 
         # iterate over word list without root word (already in self.__tree)
         # to insert all words into the tree
-        # add_word also adds the edges to the graph object
-        # using the word-labeled nodes and distance-labelled edges
-        # from the recursive tuple representation
         for word in [word for word in self.__word_list
                      if word != self.__root_word]:
             self.__add_word(self.__tree, word)
 
-        # get tree depth using recursive traversal
-        # node_depths stores the depth of every node
-        # max of node_depths values is the max tree depth
-        # start by adding the root_word with depth zero
-        self.__node_depths = {self.__root_word: 0}
-        self.__get_tree_depth(self.tree)
-        self.__tree_depth = max(self.__node_depths.values())
+        # collect tree statistics (depth histogram, fan-out and edge
+        # distance distribution) in one iterative traversal
+        self.__tree_stats = TreeStats(self.tree)
+
+        # query planner: searches whose estimated share of visited nodes
+        # exceeds the threshold scan all words instead of the tree
+        self.__scan_threshold = 0.1
+        # words in breadth-first order for the linear scan, created on
+        # first use
+        self.__scan_words = None
+        # (d, length bucket) : [estimated share of visited nodes, number
+        # of searches the estimate is based on, number of scans since the
+        # last refinement], short search words visit more nodes than long
+        # ones for the same d
+        self.__visited_fractions = dict()
+        # length bucket : words of the tree, created on first use
+        self.__length_buckets = None
+        # every n-th scan for an estimate refines it with a capped tree
+        # search, so that an estimate leading to scans can still drop
+        self.__refine_interval = 16
+        self.__last_plan = None
+        # path : [number of searches, total seconds]
+        self.__path_timings = {path: [0, 0.0] for path in self.search_paths}
 
         # save graph as .dot in output folder
         # create output folder if it is nonexistent
@@ -105,7 +200,7 @@ class BKTree:
         file_name = f"{self.__root_word}_{self.__dist_func.__name__}_" \
                     f"{date_suffix}"
 
-        write_dot(self.graph, f"src/model/output/{file_name}.dot")
+        self.export_dot(f"src/model/output/{file_name}.dot")
 
         # save BKTree object as .pkl in output folder to recreate it for
         # interactive mode and graphical visualization
@@ -118,25 +213,35 @@ class BKTree:
         The distance between parent word and child word is computed
         using one of the metrics defined in metrics.py.
         The function for the metric is stored in the dist_func attribute.
-        The labeled edges are added to the DiGraph object used to graphically
-        visualize the tree (in view component).
         @param tree: Tuple representation of the BKTree.
         @param word: New word (labeled node) to be added to the BKTree, as str.
         """
         # compute the distance between parent word and child word
         parent_word = tree[0]
-        distance = self.__dist_func(parent_word, word)
+        distance = self.__distance(parent_word, word)
         # if the current node already has a child with distance d
         # recursively proceed with this child tree
         if distance in tree[1]:
             self.__add_word(tree[1][distance], word)
         else:
             tree[1][distance] = (word, dict())
-            # build up graph here to save computation time
-            # i.e. no second for loop/recursive function necessary
-            # parent_word and word are recognized as nodes by networkx
-            self.graph.add_edge(f"{parent_word}", f"{word}",
-                                weight=distance)
+
+    def __distance(self, word1, word2, k=None):
+        """
+        Computes the distance between two words using the tree's metric.
+        If the tree has a distance cache, the distance is looked up there
+        first.
+        @param word1: First word as str.
+        @param word2: Second word as str.
+        @param k: Optional upper bound for the distance as int (>= 0).
+        If given, the bounded version of the metric is used.
+        @return: Distance as int, k + 1 if it exceeds the bound k.
+        """
+        if self.__cache is not None:
+            return self.__cache.distance(word1, word2, k)
+        if k is None:
+            return self.__dist_func(word1, word2)
+        return self.__bounded_dist_func(word1, word2, k)
 
     @property
     def root(self):
@@ -149,21 +254,57 @@ class BKTree:
     @property
     def graph(self):
         """
-        Returns the DiGraph object of the tree that was built up
-        using the tree's tuple representation.
+        Returns the DiGraph object of the tree that is built up
+        using the tree's tuple representation on first access.
+        For large trees, export_dot should be used instead.
         @return: DiGraph object of the tree.
         """
+        if self.__graph is None:
+            self.__graph = nx.DiGraph()
+            # parent_word and word are recognized as nodes by networkx
+            for parent_word, distance, (word, _), _ \
+                    in self.__iter_edges(self.tree):
+                self.__graph.add_edge(parent_word, word, weight=distance)
         return self.__graph
 
     @property
     def num_of_words(self):
         """
         Returns the number of words in the BKTree/word_list the tree
-        was built up from.
+        was built up from. If the tree has a normalizer, the number of
+        distinct normalized keys is returned.
         @return: Number of words as int.
         """
         return len(self.__word_list)
 
+    @property
+    def normalizer(self):
+        """
+        Returns the normalizer mapping words to the keys in the tree.
+        @return: Normalizer object or None if words are not normalized.
+        """
+        return self.__normalizer
+
+    def normalize(self, word):
+        """
+        Normalizes a word to the key it is represented by in the tree.
+        @param word: Word as str.
+        @return: Normalized key as str (the word itself if the tree has
+        no normalizer).
+        """
+        if self.__normalizer is None:
+            return word
+        return self.__normalizer(word)
+
+    def surface_forms(self, key):
+        """
+        Returns the original words of the word list that were normalized
+        to the given key.
+        @param key: Normalized key (node) of the tree as str.
+        @return: Surface forms as list of str.
+        """
+        return self.__surface_forms.get(key, [key])
+
     @property
     def tree(self):
         """
@@ -175,6 +316,27 @@ class BKTree:
         """
         return self.__tree
 
+    @property
+    def cache(self):
+        """
+        Returns the distance cache of the tree, it can be passed on to a
+        new tree built with the same metric.
+        @return: DistanceCache object or None if distances are not cached.
+        """
+        return self.__cache
+
+    @property
+    def cache_stats(self):
+        """
+        Returns the statistics of the distance cache (size, maxsize, hits,
+        misses, evictions, and hit rate).
+        @return: Dict of statistic name (str) and value or None if distances
+        are not cached.
+        """
+        if self.__cache is None:
+            return None
+        return self.__cache.stats
+
     @property
     def tree_depth(self):
         """
@@ -182,46 +344,244 @@ class BKTree:
         from the root to a leaf.
         @return: Maximum tree depth as int.
         """
-        return self.__tree_depth
-
-    def __get_tree_depth(self, tree):
-        """
-        Recursively traverse the tree and get the depth of every node
-        to determine the maximum tree depth. Individual node depths are
-        stored in the object attribute node_depths (dict) which
-        presupposes that an individual word only occurs once in the
-        tree, otherwise the node depth would be overridden to the
-        depth of the latest occurrence.
-        @param tree: Tuple representation of the tree/subtree.
-        """
-        # access child dict of current node
-        for ele in tree[1]:
-            # Termination condition:
-            # if child has no subtree(s), stop here and set
-            # depth(child) to depth(parent) + 1
-            if not tree[1][ele][1]:
-                self.__node_depths[tree[1][ele][0]] \
-                    = self.__node_depths[tree[0]] + 1
-            # if child has subtree(s)
+        return self.__tree_stats.max_depth
+
+    @property
+    def tree_stats(self):
+        """
+        Returns the structural statistics of the tree (depth histogram,
+        fan-out and edge distance distribution).
+        @return: TreeStats object.
+        """
+        return self.__tree_stats
+
+    @property
+    def scan_threshold(self):
+        """
+        Returns the estimated share of visited nodes above which the query
+        planner scans all words instead of searching the tree.
+        @return: Threshold as float between 0 and 1.
+        """
+        return self.__scan_threshold
+
+    @scan_threshold.setter
+    def scan_threshold(self, threshold):
+        """
+        Sets the threshold of the query planner, e.g. after comparing the
+        timings of both search paths (see time_paths).
+        @param threshold: Threshold as int/float between 0 and 1,
+        0 always scans, 1 always searches the tree.
+        """
+        assert isinstance(threshold, (int, float)) and 0 <= threshold <= 1, \
+            "Attribute 'threshold' must be a number between 0 and 1."
+        self.__scan_threshold = threshold
+        # estimates were sampled with searches stopped at the old threshold
+        self.__visited_fractions.clear()
+
+    def estimate_visited_fraction(self, d, word_length=None,
+                                  sample_size=5):
+        """
+        Estimates the share of nodes a search with maximum distance d
+        visits. The estimate is sampled once per d and length bucket
+        (word lengths 0-1, 2-3, 4-5, ...) from searches for randomly chosen
+        words of the tree of a similar length, which stop as soon as they
+        exceed the scan threshold, i.e. sampling never costs more than
+        sample_size scans. Afterwards, the estimate is refined with the
+        number of nodes visited by every search using the tree and by a
+        capped tree search for every n-th scan. Since the sampled searches
+        stop at the threshold, estimates above it only indicate a scan.
+        @param d: Maximum distance as int (>= 0).
+        @param word_length: Optional length of the search word as int. By
+        default, words of any length are sampled.
+        @param sample_size: Number of sampled search words as int.
+        @return: Estimated share of visited nodes as float between 0 and 1.
+        """
+        key = (d, self.__length_bucket(word_length))
+        if key not in self.__visited_fractions:
+            if key[1] is None:
+                words = self.__word_list
             else:
-                # depth(child) = depth(parent) + 1
-                self.__node_depths[tree[1][ele][0]] \
-                    = self.__node_depths[tree[0]] + 1
-                # recursively proceed
-                self.__get_tree_depth(tree[1][ele])
+                if self.__length_buckets is None:
+                    self.__length_buckets = dict()
+                    for word in self.__word_list:
+                        self.__length_buckets.setdefault(
+                            self.__length_bucket(len(word)), []).append(word)
+                # no word of the tree may be as long as the search word
+                words = self.__length_buckets[min(
+                    self.__length_buckets,
+                    key=lambda bucket: abs(bucket - key[1]))]
+            max_visited = int(self.__scan_threshold * self.num_of_words) + 1
+            sample = random.sample(words, min(sample_size, len(words)))
+            visited = sum(self.__search(word, d, max_visited=max_visited)[1]
+                          for word in sample)
+            self.__visited_fractions[key] = [
+                visited / len(sample) / self.num_of_words, len(sample), 0]
+        return self.__visited_fractions[key][0]
 
-    def search(self, search_word, d):
+    @staticmethod
+    def __length_bucket(word_length):
+        """
+        Groups word lengths for the estimates of the query planner.
+        @param word_length: Word length as int or None.
+        @return: Length bucket as int or None.
         """
-        Recursively searches for words in the BKTree exhibiting a maximum
+        return None if word_length is None else word_length // 2
+
+    def __refine_visited_fraction(self, key, visited):
+        """
+        Adds the number of nodes visited by a search to the running mean
+        of the estimated share of visited nodes, if it was estimated.
+        @param key: Tuple of maximum distance d (int) and length bucket.
+        @param visited: Number of visited nodes as int.
+        """
+        if key in self.__visited_fractions:
+            fraction, searches, _ = self.__visited_fractions[key]
+            self.__visited_fractions[key] = [
+                (fraction * searches + visited / self.num_of_words)
+                / (searches + 1), searches + 1, 0]
+
+    @property
+    def last_plan(self):
+        """
+        Returns the decision of the query planner for the latest search.
+        @return: Dict with the chosen path (str), the estimated share of
+        visited nodes (float, None if the path was forced), the threshold
+        (float), and the search time in seconds (float), or None if nothing
+        was searched yet.
+        """
+        return self.__last_plan
+
+    @property
+    def path_timings(self):
+        """
+        Returns the number of searches and the time spent on each search
+        path. Note that the first scan includes the compilation of the
+        scan for the tree's metric, and scans include the occasional
+        refinement of the query planner's estimate.
+        @return: Dict of path (str) and dict of number of searches (int),
+        total and mean seconds (float).
+        """
+        return {path: {"searches": searches, "seconds": seconds,
+                       "mean_seconds": seconds / searches if searches
+                       else 0.0}
+                for path, (searches, seconds)
+                in self.__path_timings.items()}
+
+    def search(self, search_word, d, path="auto"):
+        """
+        Searches for words in the BKTree exhibiting a maximum
         distance (d, distance in levenshtein/lsc units, etc.) to the search
         word. Returns the search results as a list of words.
+        If the tree has a normalizer, the search word is normalized and
+        compared to the normalized keys in the tree, the results contain
+        all original surface forms of the matching keys.
+        By default, a query planner estimates the share of nodes the
+        search would visit (see estimate_visited_fraction) and scans all
+        words in parallel instead if the share exceeds the scan threshold.
+        A forced path skips the estimate. Both paths return identical
+        results.
         @param search_word: Query string of at least one character.
         @param d: Maximum distance (levenshtein, etc.) from search word to
         any target word to be included in the results. d must be an integer
         equal to or greater than 0.
+        @param path: Search path as str, "tree", "scan", or "auto" (the
+        query planner decides).
         @return: Query results (words) as a list of strings.
         """
-        # raise errors for invalid parameters
+        self.__check_search_params(search_word, d)
+        assert path == "auto" or path in self.search_paths, \
+            "Attribute 'path' must be 'auto', 'tree', or 'scan'."
+        search_word = self.normalize(search_word)
+        # the normalizer may remove every character of the search word
+        self.__check_search_params(search_word, d)
+        fraction = None
+        if path == "auto":
+            fraction = self.estimate_visited_fraction(d, len(search_word))
+            path = "scan" if fraction > self.__scan_threshold else "tree"
+        results, seconds = self.__timed_search(search_word, d, path)
+        self.__last_plan = {"path": path, "estimated_fraction": fraction,
+                            "threshold": self.__scan_threshold,
+                            "seconds": seconds}
+        if self.__surface_forms:
+            return [word for key in results
+                    for word in self.surface_forms(key)]
+        return results
+
+    def time_paths(self, search_word, d):
+        """
+        Searches with both search paths to compare their timings, e.g. to
+        tune the scan threshold.
+        @param search_word: Query string of at least one character.
+        @param d: Maximum distance as int equal to or greater than 0.
+        @return: Dict of path (str) and search time in seconds (float).
+        """
+        self.__check_search_params(search_word, d)
+        search_word = self.normalize(search_word)
+        # the normalizer may remove every character of the search word
+        self.__check_search_params(search_word, d)
+        return {path: self.__timed_search(search_word, d, path)[1]
+                for path in self.search_paths}
+
+    def __timed_search(self, search_word, d, path):
+        """
+        Searches with the given search path and records the search time.
+        @param search_word: Normalized query string.
+        @param d: Maximum distance as int.
+        @param path: Search path as str, "tree" or "scan".
+        @return: Tuple of query results (list of str) and search time in
+        seconds (float).
+        """
+        if path == "scan" and self.__scan_words is None:
+            # words in breadth-first order of the tree, so that the scan
+            # returns the results in the same order as the tree search
+            self.__scan_words = to_scan_list(
+                word for word, _ in self.__iter_breadth_first())
+        key = (d, self.__length_bucket(len(search_word)))
+        start = perf_counter()
+        if path == "scan":
+            mask = linear_scan(self.__scan_words, search_word, d,
+                               self.__bounded_dist_func)
+            results = [self.__scan_words[i] for i in np.flatnonzero(mask)]
+            # the scan visits every node, hence a capped tree search for
+            # the same query refines the estimate, it is part of the cost
+            # of the scan path and thus included in its timing
+            if key in self.__visited_fractions:
+                self.__visited_fractions[key][2] += 1
+                if self.__visited_fractions[key][2] \
+                        >= self.__refine_interval:
+                    max_visited = int(self.__scan_threshold
+                                      * self.num_of_words) + 1
+                    self.__refine_visited_fraction(key, self.__search(
+                        search_word, d, max_visited=max_visited)[1])
+            seconds = perf_counter() - start
+        else:
+            results, visited = self.__search(search_word, d)
+            seconds = perf_counter() - start
+            self.__refine_visited_fraction(key, visited)
+        self.__path_timings[path][0] += 1
+        self.__path_timings[path][1] += seconds
+        return results, seconds
+
+    def __iter_breadth_first(self):
+        """
+        Iteratively traverses the tree breadth-first, i.e. in the order
+        in which the search visits the nodes.
+        @return: Generator of subtrees (tuple representation).
+        """
+        node_queue = deque([self.tree])
+        while node_queue:
+            tree = node_queue.popleft()
+            yield tree
+            node_queue.extend(tree[1].values())
+
+    @staticmethod
+    def __check_search_params(search_word, d):
+        """
+        Raises an error if the search word or the maximum distance d
+        are invalid.
+        @param search_word: Query string of at least one character.
+        @param d: Maximum distance as int equal to or greater than 0.
+        """
         if not isinstance(search_word, str) or len(search_word) == 0:
             raise SearchWordError("Search word must be a string equal to or"
                                   "longer than 1 character")
@@ -229,34 +589,156 @@ class BKTree:
             raise SearchDistanceError("Distance d must be an integer"
                                       " equal to or greater than 0")
 
-        # determine distance between search word and root word
-        d_root = self.__dist_func(search_word, self.__root_word)
-        # if distance too big, return empty list
-        if d_root > d:
-            return []
-        # if root within distance but no child(s), return root only
-        elif not self.tree[1]:
-            return [self.__root_word]
-        else:
-            # store results, root word has already been checked
-            results = [self.__root_word]
-            # define queue as list of tuples from child_dict of root node
-            node_queue = [(node, child_dict)
-                          for node, child_dict in self.tree[1].values()]
-            # traverse all possible child nodes, i.e. in range d-dr <= d+dr
-            while node_queue:
-                # get first element from queue and divide it out
-                node, child_dict = node_queue.pop(0)
-                # get dr, i.e. dist(wq, wr)
-                dr = self.__dist_func(search_word, node)
-                if dr <= d:
-                    results.append(node)
-                # get all possible child nodes (only in range dr-d to dr+d)
-                # from current node and proceed
-                node_queue.extend(node for dist, node in child_dict.items()
-                                  if dist in range(dr - d, dr + d + 1))
+    def __search(self, search_word, d, trace=None, max_visited=None):
+        """
+        Searches for words in the BKTree exhibiting a maximum distance d
+        to the search word, starting from the root. Parameters are not
+        validated.
+        @param search_word: Query string.
+        @param d: Maximum distance as int.
+        @param trace: Optional list to which a tuple of word, distance to
+        the search word, bound of the distance computation, and list of
+        (edge distance, word) of the children to be visited next is
+        appended for every visited node.
+        @param max_visited: Optional maximum number of nodes (int) to visit,
+        the search stops incomplete once it is reached.
+        @return: Tuple of query results (list of str) and the number of
+        visited nodes (int).
+        """
+        results = []
+        visited = 0
+        # define queue of subtrees, start with the whole tree
+        node_queue = deque([self.tree])
+        # traverse all possible child nodes, i.e. in range d-dr <= d+dr
+        while node_queue:
+            # get first element from queue and divide it out
+            node, child_dict = node_queue.popleft()
+            visited += 1
+            if visited == max_visited:
+                break
+            # get dr, i.e. dist(wq, wr), bounded by the largest
+            # child edge + d (d for leaves): larger distances cannot
+            # lead to any result
+            bound = max(child_dict, default=0) + d
+            dr = self.__distance(search_word, node, bound)
+            if dr <= d:
+                results.append(node)
+            if trace is not None:
+                trace.append((node, dr, bound,
+                              [(dist, child[0]) for dist, child
+                               in child_dict.items()
+                               if dr - d <= dist <= dr + d]))
+            # get all possible child nodes (only in range dr-d to dr+d)
+            # from current node and proceed, even if the current node
+            # itself is too far from the search word
+            node_queue.extend(child for dist, child in child_dict.items()
+                              if dr - d <= dist <= dr + d)
+        return results, visited
+
+    def search_many(self, search_words, d, path="auto"):
+        """
+        Searches for words in the BKTree exhibiting a maximum distance d
+        to each of the search words. Distances computed before (e.g. for
+        repeated search words) are served from the distance cache if the
+        tree has one.
+        @param search_words: Iterable of query strings.
+        @param d: Maximum distance from a search word to any target word
+        to be included in the results, integer equal to or greater than 0.
+        @param path: Search path as str, "tree", "scan", or "auto".
+        @return: Dict of search word (str) and query results (list of str).
+        """
+        return {search_word: self.search(search_word, d, path)
+                for search_word in search_words}
 
-        return results
+    def __iter_edges(self, tree, max_depth=None):
+        """
+        Iteratively traverses the tree (depth-first) and yields its edges
+        one by one, i.e. without building up any graph.
+        @param tree: Tuple representation of the tree/subtree to start from.
+        @param max_depth: Optional maximum depth (int) relative to the start
+        of the traversal, deeper edges are omitted.
+        @return: Generator of tuples (parent word, edge distance, child
+        subtree, depth of the child).
+        """
+        stack = [(tree, 0)]
+        while stack:
+            (parent_word, child_dict), depth = stack.pop()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for distance, child in child_dict.items():
+                yield parent_word, distance, child, depth + 1
+                stack.append((child, depth + 1))
+
+    def __find_subtree(self, word):
+        """
+        Finds the subtree whose root is the given word by following the
+        edges labeled with the distance between the current node and word.
+        @param word: Word of the tree as str.
+        @return: Tuple representation of the subtree.
+        """
+        tree = self.tree
+        while tree[0] != word:
+            distance = self.__distance(tree[0], word)
+            if distance not in tree[1]:
+                raise SearchWordError(f"'{word}' is not part of the tree")
+            tree = tree[1][distance]
+        return tree
+
+    def export_dot(self, path, max_depth=None, subtree_word=None,
+                   query=None):
+        """
+        Writes the tree or a part of it to a .dot file. Nodes and edges are
+        streamed directly from the tuple representation, so even trees with
+        millions of words can be exported without building up a graph.
+        By default, the whole tree is exported. With max_depth, only the
+        top levels are exported, with subtree_word only the subtree below
+        the given word. Nodes whose children were cut off are dashed.
+        With query, only the nodes visited during the search are exported
+        along with their distance to the search word, results are filled.
+        @param path: File path ending in .dot, as str.
+        @param max_depth: Optional number of levels (int) to export below
+        the root/subtree_word.
+        @param subtree_word: Optional word of the tree (str) whose subtree
+        is exported. Like the search word, it is normalized first.
+        @param query: Optional tuple of search word (str) and maximum
+        distance d (int) whose search neighbourhood is exported,
+        max_depth and subtree_word are ignored then.
+        """
+        assert isinstance(path, str) and path.endswith(".dot"), \
+            "Invalid path to .dot file"
+        assert max_depth is None or (isinstance(max_depth, int)
+                                     and max_depth >= 0), \
+            "Attribute 'max_depth' must be an integer >= 0"
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("digraph BKTree {\n")
+            if query is not None:
+                search_word, d = query
+                self.__check_search_params(search_word, d)
+                search_word = self.normalize(search_word)
+                self.__check_search_params(search_word, d)
+                trace = []
+                self.__search(search_word, d, trace)
+                for word, dr, bound, children in trace:
+                    # distances beyond the bound were not fully computed
+                    label = f"{word} ({dr if dr <= bound else f'>{bound}'})"
+                    style = ", style=filled" if dr <= d else ""
+                    f.write(f"{_dot_id(word)} [label={_dot_id(label)}"
+                            f"{style}];\n")
+                    for distance, child_word in children:
+                        f.write(f"{_dot_id(word)} -> {_dot_id(child_word)}"
+                                f" [label={distance}, weight={distance}];\n")
+            else:
+                tree = self.tree if subtree_word is None \
+                    else self.__find_subtree(self.normalize(subtree_word))
+                f.write(f"{_dot_id(tree[0])};\n")
+                for parent_word, distance, (word, child_dict), depth \
+                        in self.__iter_edges(tree, max_depth):
+                    f.write(f"{_dot_id(parent_word)} -> {_dot_id(word)}"
+                            f" [label={distance}, weight={distance}];\n")
+                    if child_dict and depth == max_depth:
+                        f.write(f"{_dot_id(word)} [style=dashed];\n")
+            f.write("}\n")
 
     @staticmethod
     def __check_list_integrity(word_list2):
@@ -264,14 +746,62 @@ class BKTree:
         Assures that every element in the list is a single word
         as str, especially when the word list was read in from a
         .txt file. Raises an error if this is not the case.
+        Empty strings are no words either, e.g. a combining accent
+        that is removed by the normalizer.
         @param word_list2: List of words (str).
         """
         for ele in word_list2:
-            if not isinstance(ele, str) or len(ele.split()) > 1 \
+            if not isinstance(ele, str) or len(ele.split()) != 1 \
                     or ele.isnumeric():
                 raise ListIntegrityError("Every element in the word"
                                          " list must be a single word")
 
+    def __getstate__(self):
+        """
+        Omits the word list of the linear scan and the length buckets of
+        the query planner when the BKTree is pickled, they are recreated
+        on first use.
+        @return: State dict of the object.
+        """
+        state = self.__dict__.copy()
+        state["_BKTree__scan_words"] = None
+        state["_BKTree__length_buckets"] = None
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores a pickled BKTree. Trees pickled by older versions lack
+        some attributes, which are filled with their defaults.
+        @param state: State dict of the object.
+        """
+        # depths were replaced by the tree statistics
+        state.pop("_BKTree__node_depths", None)
+        state.pop("_BKTree__tree_depth", None)
+        self.__dict__.update(state)
+        defaults = {
+            "bounded_dist_func": lambda: bounded_metrics[
+                self.__dist_func.__name__],
+            "cache": lambda: None,
+            "tree_stats": lambda: TreeStats(self.__tree),
+            "normalizer": lambda: None,
+            "surface_forms": dict,
+            "scan_threshold": lambda: 0.1,
+            "scan_words": lambda: None,
+            "visited_fractions": dict,
+            "length_buckets": lambda: None,
+            "refine_interval": lambda: 16,
+            "last_plan": lambda: None,
+            "path_timings": lambda: {path: [0, 0.0]
+                                     for path in self.search_paths}
+        }
+        for name, default in defaults.items():
+            if f"_BKTree__{name}" not in self.__dict__:
+                setattr(self, f"_BKTree__{name}", default())
+        # estimates keyed by d only are sampled again
+        self.__visited_fractions = {
+            key: record for key, record in self.__visited_fractions.items()
+            if isinstance(key, tuple)}
+
     def __save_as_pkl(self, path):
         """
         Serializes and stores the BKTree object as a pickle object
@@ -284,6 +814,15 @@ class BKTree:
             pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
 
 
+def _dot_id(word):
+    """
+    Quotes a word for the use as node ID/label in the dot language.
+    @param word: Word as str.
+    @return: Quoted word as str.
+    """
+    return '"' + word.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
 def read_from_pkl(path):
     """
     Recreates a BKTree instance from a pickle file.
@@ -0,0 +1,232 @@
+# Author: agent
+# Date: October 19, 2026
+# Python 3.11
+# Linux
+
+from collections import OrderedDict
+
+
+class DistanceCache:
+    """
+    Bounded memo cache for the distances computed by a string metric.
+    Every word is interned as an integer ID, the cached distances are keyed
+    on the (symmetric) ID pair, i.e. dist(a, b) and dist(b, a) share one
+    entry. If the cache is full, the least recently used entry is evicted.
+    Since a cache only holds distances of a single metric, it can be reused
+    by several BKTree instances built with that metric (e.g. a rebuild after
+    small changes of the vocabulary).
+    """
+
+    def __init__(self, dist_func, bounded_dist_func, maxsize=100000):
+        """
+        Instantiates a DistanceCache for the given metric.
+        @param dist_func: Distance function taking two words (callable).
+        @param bounded_dist_func: Bounded version of the distance function
+        taking two words and a bound k (callable).
+        @param maxsize: Maximum number of cached distances as int (> 0).
+        """
+        assert isinstance(maxsize, int) and maxsize > 0, \
+            "Attribute 'maxsize' must be a positive integer."
+        self.__dist_func = dist_func
+        self.__bounded_dist_func = bounded_dist_func
+        self.__maxsize = maxsize
+        # (id1, id2) : (distance, exact)
+        # inexact entries store k + 1 of a bounded computation, i.e.
+        # the distance is known to be greater than k
+        self.__entries = OrderedDict()
+        # word : ID of the pinned words (vocabulary of the tree), they
+        # keep their IDs as long as the cache exists
+        self.__ids = dict()
+        # word : ID of any other word (e.g. query words), forgotten once
+        # there are more of them than could ever be cached
+        # IDs are never reused, so entries of forgotten words can never
+        # be hit again and are evicted eventually
+        self.__query_ids = dict()
+        self.__next_id = 0
+        # root word of the latest tree built with the cache
+        self.__root = None
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    @property
+    def metric_name(self):
+        """
+        Returns the name of the metric whose distances are cached.
+        @return: Function name of the metric as str.
+        """
+        return self.__dist_func.__name__
+
+    @property
+    def root(self):
+        """
+        Returns the root word of the latest tree built with the cache.
+        A rebuilt tree reusing this root repeats most of the distance
+        computations of its insertions.
+        @return: Root word as str or None.
+        """
+        return self.__root
+
+    @root.setter
+    def root(self, word):
+        """
+        Sets the root word of the latest tree built with the cache.
+        @param word: Root word as str.
+        """
+        self.__root = word
+
+    @property
+    def maxsize(self):
+        """
+        Returns the maximum number of cached distances.
+        @return: Maximum cache size as int.
+        """
+        return self.__maxsize
+
+    @property
+    def size(self):
+        """
+        Returns the current number of cached distances.
+        @return: Cache size as int.
+        """
+        return len(self.__entries)
+
+    @property
+    def hits(self):
+        """
+        Returns the number of distance lookups answered by the cache.
+        @return: Number of hits as int.
+        """
+        return self.__hits
+
+    @property
+    def misses(self):
+        """
+        Returns the number of distance lookups that required a computation.
+        @return: Number of misses as int.
+        """
+        return self.__misses
+
+    @property
+    def evictions(self):
+        """
+        Returns the number of entries evicted from the full cache.
+        @return: Number of evictions as int.
+        """
+        return self.__evictions
+
+    @property
+    def hit_rate(self):
+        """
+        Returns the share of distance lookups answered by the cache.
+        @return: Hit rate as float between 0 and 1 (0 if no lookups yet).
+        """
+        lookups = self.__hits + self.__misses
+        return self.__hits / lookups if lookups else 0.0
+
+    @property
+    def stats(self):
+        """
+        Returns all cache statistics.
+        @return: Dict of statistic name (str) and value.
+        """
+        return {"size": self.size, "maxsize": self.maxsize,
+                "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "hit_rate": self.hit_rate}
+
+    def pin(self, words):
+        """
+        Assigns permanent IDs to the given words (e.g. the vocabulary of a
+        tree), so that their cached distances are never orphaned.
+        @param words: Iterable of words (str).
+        """
+        for word in words:
+            if word not in self.__ids:
+                word_id = self.__query_ids.pop(word, None)
+                if word_id is None:
+                    word_id = self.__next_id
+                    self.__next_id += 1
+                self.__ids[word] = word_id
+
+    def intern(self, word):
+        """
+        Returns the ID of a word, a new ID is assigned to unknown words.
+        Unless the word is pinned, its ID may be forgotten later on.
+        @param word: Word as str.
+        @return: ID as int.
+        """
+        word_id = self.__ids.get(word)
+        if word_id is None:
+            word_id = self.__query_ids.get(word)
+        if word_id is None:
+            # forget the IDs of unpinned words once there are more of
+            # them than could ever be cached
+            if len(self.__query_ids) >= 2 * self.__maxsize:
+                self.__query_ids.clear()
+            word_id = self.__query_ids[word] = self.__next_id
+            self.__next_id += 1
+        return word_id
+
+    def distance(self, word1, word2, k=None):
+        """
+        Returns the distance between two words from the cache or computes
+        and caches it if necessary.
+        @param word1: First word as str.
+        @param word2: Second word as str.
+        @param k: Optional upper bound for the distance as int (>= 0).
+        If given, the bounded metric is used on cache misses.
+        @return: Distance as int, k + 1 if it exceeds the bound k.
+        """
+        id1 = self.intern(word1)
+        id2 = self.intern(word2)
+        key = (id1, id2) if id1 <= id2 else (id2, id1)
+        entry = self.__entries.get(key)
+        if entry is not None:
+            dist, exact = entry
+            # exact distances answer every lookup, bounded ones only
+            # lookups with a bound that is not larger
+            if exact or (k is not None and k < dist):
+                self.__hits += 1
+                self.__entries.move_to_end(key)
+                if k is not None and dist > k:
+                    return k + 1
+                return dist
+        self.__misses += 1
+        if k is None:
+            dist = self.__dist_func(word1, word2)
+            exact = True
+        else:
+            dist = self.__bounded_dist_func(word1, word2, k)
+            exact = dist <= k
+        self.__entries[key] = (dist, exact)
+        self.__entries.move_to_end(key)
+        if len(self.__entries) > self.__maxsize:
+            self.__entries.popitem(last=False)
+            self.__evictions += 1
+        return dist
+
+    def clear(self):
+        """
+        Removes all cached distances and word IDs and resets the statistics.
+        """
+        self.__entries.clear()
+        self.__ids.clear()
+        self.__query_ids.clear()
+        self.__root = None
+        self.__hits = self.__misses = self.__evictions = 0
+
+    def __getstate__(self):
+        """
+        Omits the cached distances, all word IDs and the root word when the
+        cache is pickled (as part of a BKTree) to keep the .pkl file small.
+        Without the distances, the IDs would only be a second copy of the
+        vocabulary. The statistics are kept.
+        @return: State dict of the object.
+        """
+        state = self.__dict__.copy()
+        state["_DistanceCache__entries"] = OrderedDict()
+        state["_DistanceCache__ids"] = dict()
+        state["_DistanceCache__query_ids"] = dict()
+        state["_DistanceCache__next_id"] = 0
+        state["_DistanceCache__root"] = None
+        return state
@@ -0,0 +1,41 @@
+# Author: agent
+# Date: October 19, 2026
+# Python 3.11
+# Linux
+
+import numpy as np
+from numba import njit, prange
+from numba.typed import List
+
+
+def to_scan_list(words):
+    """
+    Converts words into a typed list that can be passed to linear_scan.
+    @param words: Iterable of words (str).
+    @return: numba.typed.List of words.
+    """
+    return List(words)
+
+
+@njit(parallel=True)
+def linear_scan(words, search_word, d, bounded_dist_func, chunk_size=1024):
+    """
+    Compares the search word to every word, the chunks of words are
+    processed in parallel. Since the bounded metric stops as soon as the
+    distance exceeds d, most comparisons are cheap.
+    @param words: numba.typed.List of words (str), see to_scan_list.
+    @param search_word: Query string.
+    @param d: Maximum distance as int.
+    @param bounded_dist_func: Bounded distance function taking two words
+    and a bound k (compiled callable, see bounded_metrics).
+    @param chunk_size: Number of words per parallel chunk as int.
+    @return: Boolean array, True for every word within distance d.
+    """
+    n = len(words)
+    mask = np.zeros(n, dtype=np.bool_)
+    num_chunks = (n + chunk_size - 1) // chunk_size
+    for chunk in prange(num_chunks):
+        start = chunk * chunk_size
+        for i in range(start, min(start + chunk_size, n)):
+            mask[i] = bounded_dist_func(search_word, words[i], d) <= d
+    return mask
@@ -77,10 +77,418 @@ def lsc_distance(word1, word2):
     return (m-lcs) + (n-lcs)
 
 
+@njit(fastmath=True)
+def levenshtein_bounded(word1, word2, k):
+    """
+    Computes the levenshtein distance between two words as long as it does
+    not exceed the bound k. The computation stops as soon as every cell of
+    the current matrix row exceeds k, since the distance can only grow
+    from there on.
+    @param word1: First word to be compared as str.
+    @param word2: Second word to be compared as str.
+    @param k: Upper bound for the distance as int (>= 0).
+    @return: Levenshtein distance as int if it is smaller than or equal
+    to k, otherwise k + 1.
+    """
+    n = len(word1)
+    m = len(word2)
+
+    # the length difference is a lower bound of the distance
+    if abs(n - m) > k:
+        return k + 1
+
+    # only the previous and current row of the matrix are needed
+    prev_row = np.arange(m+1)
+    curr_row = np.zeros(m+1, dtype=np.int64)
+
+    for p in range(1, n+1):
+        curr_row[0] = p
+        row_min = p
+        for q in range(1, m+1):
+            curr_row[q] = min(prev_row[q] + 1,
+                              prev_row[q-1] +
+                              (1 if word1[p-1] != word2[q-1] else 0),
+                              curr_row[q-1] + 1)
+            row_min = min(row_min, curr_row[q])
+        if row_min > k:
+            return k + 1
+        prev_row, curr_row = curr_row, prev_row
+
+    return min(int(prev_row[m]), k + 1)
+
+
+@njit(fastmath=True)
+def lsc_distance_bounded(word1, word2, k):
+    """
+    Computes the LSC distance between two words as long as it does not
+    exceed the bound k. Unlike lsc_distance, the matrix holds the edit
+    costs (insertions and deletions) directly so that the computation can
+    stop as soon as every cell of the current row exceeds k.
+    @param word1: First word to be compared as str.
+    @param word2: Second word to be compared as str.
+    @param k: Upper bound for the distance as int (>= 0).
+    @return: LSC distance as int if it is smaller than or equal to k,
+    otherwise k + 1.
+    """
+    m = len(word1)
+    n = len(word2)
+
+    if abs(m - n) > k:
+        return k + 1
+
+    prev_row = np.arange(n+1)
+    curr_row = np.zeros(n+1, dtype=np.int64)
+
+    for i in range(1, m+1):
+        curr_row[0] = i
+        row_min = i
+        for j in range(1, n+1):
+            if word1[i-1] == word2[j-1]:
+                curr_row[j] = prev_row[j-1]
+            else:
+                curr_row[j] = min(prev_row[j], curr_row[j-1]) + 1
+            row_min = min(row_min, curr_row[j])
+        if row_min > k:
+            return k + 1
+        prev_row, curr_row = curr_row, prev_row
+
+    return min(int(prev_row[n]), k + 1)
+
+
+@njit
+def _alphabet_indices(word1, word2):
+    """
+    Maps the characters of both words onto a compact alphabet, i.e. every
+    distinct character is assigned an index between 0 and the number of
+    distinct characters - 1.
+    @param word1: First word as str.
+    @param word2: Second word as str.
+    @return: Index arrays of word1 and word2 and the alphabet size.
+    """
+    n = len(word1)
+    chars = word1 + word2
+    indices = np.full(len(chars), -1, dtype=np.int64)
+    size = 0
+    for p in range(len(chars)):
+        for q in range(p):
+            if chars[q] == chars[p]:
+                indices[p] = indices[q]
+                break
+        if indices[p] == -1:
+            indices[p] = size
+            size += 1
+    return indices[:n], indices[n:], size
+
+
+@njit(fastmath=True)
+def _damerau_levenshtein(word1, word2, k):
+    """
+    Computes the (unrestricted) Damerau-Levenshtein distance between two
+    words, optionally bounded by k. The row minima of the distance matrix
+    never decrease (a transposition reads an earlier row and adds at least
+    1 per skipped row), so the computation can stop as soon as every cell
+    of the current row exceeds k.
+    @param word1: First word to be compared as str.
+    @param word2: Second word to be compared as str.
+    @param k: Upper bound for the distance as int, negative for no bound.
+    @return: Damerau-Levenshtein distance as int, k + 1 if it exceeds the
+    bound.
+    """
+    n = len(word1)
+    m = len(word2)
+
+    if k >= 0 and abs(n - m) > k:
+        return k + 1
+    if n == 0 or m == 0:
+        return max(n, m)
+
+    idx1, idx2, size = _alphabet_indices(word1, word2)
+    # last row in which each character occurred in word1
+    last_row = np.zeros(size, dtype=np.int64)
+
+    # distance matrix with an additional border row/column holding
+    # the maximum distance
+    max_dist = n + m
+    dist_mtrx = np.zeros((n+2, m+2), dtype=np.int64)
+    dist_mtrx[0, :] = max_dist
+    dist_mtrx[:, 0] = max_dist
+    dist_mtrx[1, 1:] = np.arange(m+1)
+    dist_mtrx[1:, 1] = np.arange(n+1)
+
+    for p in range(1, n+1):
+        # last column in which word1[p-1] matched in the current row
+        last_col = 0
+        row_min = p
+        for q in range(1, m+1):
+            p1 = last_row[idx2[q-1]]
+            q1 = last_col
+            if idx1[p-1] == idx2[q-1]:
+                cost = 0
+                last_col = q
+            else:
+                cost = 1
+            dist_mtrx[p+1, q+1] = min(dist_mtrx[p, q] + cost,
+                                      dist_mtrx[p+1, q] + 1,
+                                      dist_mtrx[p, q+1] + 1,
+                                      dist_mtrx[p1, q1] +
+                                      (p - p1 - 1) + 1 + (q - q1 - 1))
+            row_min = min(row_min, dist_mtrx[p+1, q+1])
+        if 0 <= k < row_min:
+            return k + 1
+        last_row[idx1[p-1]] = p
+
+    if 0 <= k < dist_mtrx[n+1, m+1]:
+        return k + 1
+    return int(dist_mtrx[n+1, m+1])
+
+
+@njit(fastmath=True)
+def damerau_levenshtein(word1, word2):
+    """
+    Computes the (unrestricted) Damerau-Levenshtein distance between two
+    words. In addition to insertions, deletions and substitutions, the
+    transposition of two adjacent characters counts as a single edit, even
+    if the transposed characters are edited further afterwards. Each edit
+    has a cost of 1. In contrast to the optimal string alignment distance,
+    the Damerau-Levenshtein distance satisfies the triangle inequality.
+    @param word1: First word to be compared as str.
+    @param word2: Second word to be compared as str.
+    @return: Damerau-Levenshtein distance as int.
+    """
+    return _damerau_levenshtein(word1, word2, -1)
+
+
+@njit(fastmath=True)
+def damerau_levenshtein_bounded(word1, word2, k):
+    """
+    Computes the Damerau-Levenshtein distance between two words as long
+    as it does not exceed the bound k. The computation stops as soon as
+    every cell of the current matrix row exceeds k.
+    @param word1: First word to be compared as str.
+    @param word2: Second word to be compared as str.
+    @param k: Upper bound for the distance as int (>= 0).
+    @return: Damerau-Levenshtein distance as int if it is smaller than or
+    equal to k, otherwise k + 1.
+    """
+    return _damerau_levenshtein(word1, word2, k)
+
+
+@njit(fastmath=True)
+def osa_distance(word1, word2):
+    """
+    Computes the optimal string alignment distance (restricted
+    Damerau-Levenshtein distance) between two words. Adjacent characters
+    may be transposed at a cost of 1, but no substring may be edited more
+    than once. The distance violates the triangle inequality
+    (e.g. 'ca' -> 'ac' -> 'abc') and is therefore not available as a
+    BKTree metric.
+    @param word1: First word to be compared as str.
+    @param word2: Second word to be compared as str.
+    @return: OSA distance as int.
+    """
+    n = len(word1)
+    m = len(word2)
+
+    dist_mtrx = np.zeros((n+1, m+1), dtype=np.int64)
+    dist_mtrx[0] = np.arange(m+1)
+    dist_mtrx[:, 0] = np.arange(n+1)
+
+    for p in range(1, n+1):
+        for q in range(1, m+1):
+            cost = 1 if word1[p-1] != word2[q-1] else 0
+            dist_mtrx[p, q] = min(dist_mtrx[p-1, q] + 1,
+                                  dist_mtrx[p-1, q-1] + cost,
+                                  dist_mtrx[p, q-1] + 1)
+            if p > 1 and q > 1 and word1[p-1] == word2[q-2] \
+                    and word1[p-2] == word2[q-1]:
+                dist_mtrx[p, q] = min(dist_mtrx[p, q],
+                                      dist_mtrx[p-2, q-2] + 1)
+
+    return int(dist_mtrx[n, m])
+
+
+@njit(fastmath=True)
+def _weighted_levenshtein(word1, word2, alphabet, sub_costs, default_sub,
+                          indel, k):
+    """
+    Computes the weighted levenshtein distance between two words.
+    Substitution costs of characters in the alphabet are looked up in
+    the cost table, every other substitution costs default_sub and every
+    insertion/deletion costs indel.
+    @param word1: First word to be compared as str.
+    @param word2: Second word to be compared as str.
+    @param alphabet: Characters of the cost table as str.
+    @param sub_costs: Substitution cost table (2D int array), row and
+    column order follows the alphabet.
+    @param default_sub: Cost of substitutions outside the cost table, as int.
+    @param indel: Cost of an insertion/deletion as int.
+    @param k: Upper bound for the distance as int, negative for no bound.
+    @return: Weighted distance as int, k + 1 if it exceeds the bound.
+    """
+    n = len(word1)
+    m = len(word2)
+
+    if k >= 0 and abs(n - m) * indel > k:
+        return k + 1
+
+    # look up the cost table index of every character once
+    idx1 = np.empty(n, dtype=np.int64)
+    idx2 = np.empty(m, dtype=np.int64)
+    for p in range(n):
+        idx1[p] = alphabet.find(word1[p])
+    for q in range(m):
+        idx2[q] = alphabet.find(word2[q])
+
+    prev_row = np.arange(m+1) * indel
+    curr_row = np.zeros(m+1, dtype=np.int64)
+
+    for p in range(1, n+1):
+        curr_row[0] = p * indel
+        row_min = curr_row[0]
+        for q in range(1, m+1):
+            if word1[p-1] == word2[q-1]:
+                cost = 0
+            elif idx1[p-1] >= 0 and idx2[q-1] >= 0:
+                cost = sub_costs[idx1[p-1], idx2[q-1]]
+            else:
+                cost = default_sub
+            curr_row[q] = min(prev_row[q] + indel,
+                              prev_row[q-1] + cost,
+                              curr_row[q-1] + indel)
+            row_min = min(row_min, curr_row[q])
+        if 0 <= k < row_min:
+            return k + 1
+        prev_row, curr_row = curr_row, prev_row
+
+    if 0 <= k < prev_row[m]:
+        return k + 1
+    return int(prev_row[m])
+
+
+def _check_cost_table(alphabet, sub_costs, default_sub, indel):
+    """
+    Assures that a weighted levenshtein distance with the given costs is
+    a metric. Raises a MetricError if this is not the case.
+    @param alphabet: Characters of the cost table as str.
+    @param sub_costs: Substitution cost table as 2D int array.
+    @param default_sub: Cost of substitutions outside the cost table, as int.
+    @param indel: Cost of an insertion/deletion as int.
+    """
+    if not isinstance(alphabet, str) or len(set(alphabet)) != len(alphabet):
+        raise MetricError("Alphabet must be a string of unique characters.")
+    if sub_costs.shape != (len(alphabet), len(alphabet)) \
+            or not np.issubdtype(sub_costs.dtype, np.integer):
+        raise MetricError("Substitution costs must be a square integer "
+                          "table matching the alphabet.")
+    if not isinstance(default_sub, int) or not isinstance(indel, int) \
+            or default_sub < 1 or indel < 1:
+        raise MetricError("Default substitution and insertion/deletion "
+                          "costs must be positive integers.")
+    off_diagonal = ~np.eye(len(alphabet), dtype=bool)
+    if (sub_costs != sub_costs.T).any() or sub_costs.diagonal().any() \
+            or (sub_costs[off_diagonal] < 1).any():
+        raise MetricError("Substitution costs must be symmetric, zero on "
+                          "the diagonal and positive everywhere else.")
+    # sub(a, c) <= sub(a, b) + sub(b, c), characters outside the table
+    # are covered by sub(a, c) <= 2 * default_sub
+    two_step = (sub_costs[:, :, None] + sub_costs[None, :, :]).min(axis=1)
+    if (sub_costs > two_step).any() or (sub_costs > 2 * default_sub).any():
+        raise MetricError("Substitution costs must satisfy the "
+                          "triangle inequality.")
+
+
+def weighted_levenshtein_metric(alphabet, sub_costs, default_sub=1, indel=1,
+                                name="weighted_levenshtein"):
+    """
+    Creates a weighted levenshtein distance from an integer substitution
+    cost table. The table is validated so that the resulting distance
+    remains a metric usable by the BKTree. The metric can be made
+    available to the BKTree via register_metric.
+    @param alphabet: Characters of the cost table as str.
+    @param sub_costs: Substitution cost table (2D int array-like), row and
+    column order follows the alphabet.
+    @param default_sub: Cost of substitutions outside the cost table, as int.
+    @param indel: Cost of an insertion/deletion as int.
+    @param name: Name of the metric as str.
+    @return: Tuple of the metric and its bounded version (callables).
+    """
+    sub_costs = np.asarray(sub_costs)
+    _check_cost_table(alphabet, sub_costs, default_sub, indel)
+    sub_costs = np.ascontiguousarray(sub_costs, dtype=np.int64)
+
+    @njit(fastmath=True)
+    def metric(word1, word2):
+        return _weighted_levenshtein(word1, word2, alphabet, sub_costs,
+                                     default_sub, indel, -1)
+
+    @njit(fastmath=True)
+    def bounded_metric(word1, word2, k):
+        return _weighted_levenshtein(word1, word2, alphabet, sub_costs,
+                                     default_sub, indel, k)
+
+    metric.__name__ = name
+    bounded_metric.__name__ = f"{name}_bounded"
+    return metric, bounded_metric
+
+
+def _keyboard_costs(rows):
+    """
+    Creates a substitution cost table from keyboard rows: substituting
+    neighbouring keys costs 1, any other substitution costs 2.
+    @param rows: Keyboard rows as list of str, each row is shifted
+    half a key to the right of the row above.
+    @return: Tuple of alphabet (str) and cost table (2D int array).
+    """
+    alphabet = "".join(rows)
+    costs = np.full((len(alphabet), len(alphabet)), 2, dtype=np.int64)
+    np.fill_diagonal(costs, 0)
+    for r, row in enumerate(rows):
+        for i, char in enumerate(row):
+            neighbours = row[max(i-1, 0):i] + row[i+1:i+2]
+            if r + 1 < len(rows):
+                neighbours += rows[r+1][max(i-1, 0):i+1]
+            for neighbour in neighbours:
+                a, b = alphabet.index(char), alphabet.index(neighbour)
+                costs[a, b] = costs[b, a] = 1
+    return alphabet, costs
+
+
+# weighted levenshtein with qwerty keyboard typos: neighbouring keys cost 1,
+# every other edit costs 2, i.e. d=2 corresponds to one regular edit
+weighted_levenshtein, weighted_levenshtein_bounded = \
+    weighted_levenshtein_metric(
+        *_keyboard_costs(["qwertyuiop", "asdfghjkl", "zxcvbnm"]),
+        default_sub=2, indel=2)
+
+
 # get a dict of function name: func (callable) for all available metrics
 # allowing the implementation of further metrics without changing any code
 # (validity check for metric) in the BkTree class
 all_metrics = {
     levenshtein.__name__: levenshtein,
-    lsc_distance.__name__: lsc_distance
+    lsc_distance.__name__: lsc_distance,
+    damerau_levenshtein.__name__: damerau_levenshtein,
+    weighted_levenshtein.__name__: weighted_levenshtein
+}
+
+# bounded version of every metric in all_metrics (same key), the bounded
+# function takes an additional bound k and returns k + 1 for any distance
+# greater than k
+bounded_metrics = {
+    levenshtein.__name__: levenshtein_bounded,
+    lsc_distance.__name__: lsc_distance_bounded,
+    damerau_levenshtein.__name__: damerau_levenshtein_bounded,
+    weighted_levenshtein.__name__: weighted_levenshtein_bounded
 }
+
+
+def register_metric(metric, bounded_metric):
+    """
+    Makes a metric (e.g. created by weighted_levenshtein_metric) available
+    to the BKTree under its function name.
+    @param metric: Distance function taking two words (callable).
+    @param bounded_metric: Bounded version of the distance function taking
+    two words and a bound k (callable).
+    """
+    all_metrics[metric.__name__] = metric
+    bounded_metrics[metric.__name__] = bounded_metric
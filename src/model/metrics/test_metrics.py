@@ -3,7 +3,11 @@
 # Python 3.9
 # Windows 11
 
-from metrics import levenshtein, lsc_distance
+from metrics import levenshtein, lsc_distance, damerau_levenshtein, \
+    osa_distance, weighted_levenshtein, weighted_levenshtein_metric, \
+    levenshtein_bounded, lsc_distance_bounded, \
+    damerau_levenshtein_bounded, weighted_levenshtein_bounded, MetricError
+import pytest
 # results for levenshtein from https://planetcalc.com/1721/
 
 
@@ -63,3 +67,64 @@ class TestMetrics:
         # delete all but 'r' in paper --> (4)
         # insert s,c,i,s,s, o,s --> (11)
         assert lsc_distance("paper", "scissors") == 11
+
+    def test_transposition_damerau(self):
+        assert damerau_levenshtein("absence", "absecne") == 1
+
+    def test_transposition_osa(self):
+        assert osa_distance("absence", "absecne") == 1
+
+    def test_edited_transposition_damerau(self):
+        # 'ca' -> 'ac' (1) -> 'abc' (2)
+        assert damerau_levenshtein("ca", "abc") == 2
+
+    def test_edited_transposition_osa(self):
+        # transposed substring must not be edited again
+        assert osa_distance("ca", "abc") == 3
+
+    def test_missing_word_damerau(self):
+        assert damerau_levenshtein("", "hallo") == 5
+
+    def test_mixed_damerau(self):
+        assert damerau_levenshtein("paper", "scissors") == 7
+
+    def test_neighbouring_keys_weighted(self):
+        # 'a' and 's' are neighbours on the keyboard
+        assert weighted_levenshtein("hallo", "hsllo") == 1
+
+    def test_distant_keys_weighted(self):
+        assert weighted_levenshtein("hallo", "hpllo") == 2
+
+    def test_insertion_weighted(self):
+        assert weighted_levenshtein("hallo", "halllo") == 2
+
+    def test_custom_table_weighted(self):
+        metric, _ = weighted_levenshtein_metric("ab", [[0, 1], [1, 0]],
+                                                default_sub=3, indel=4)
+        assert metric("aab", "bac") == 4
+
+    def test_asymmetric_table_weighted(self):
+        with pytest.raises(MetricError):
+            weighted_levenshtein_metric("ab", [[0, 1], [2, 0]])
+
+    def test_triangle_inequality_weighted(self):
+        with pytest.raises(MetricError):
+            weighted_levenshtein_metric("abc", [[0, 1, 3], [1, 0, 1],
+                                                [3, 1, 0]], default_sub=2)
+
+    def test_within_bound(self):
+        assert levenshtein_bounded("absantse", "absence", 3) == 3
+        assert lsc_distance_bounded("absantse", "absence", 5) == 5
+        assert damerau_levenshtein_bounded("ca", "abc", 2) == 2
+        assert weighted_levenshtein_bounded("hallo", "hpllo", 2) == 2
+
+    def test_exceeding_bound(self):
+        assert levenshtein_bounded("paper", "scissors", 2) == 3
+        assert lsc_distance_bounded("paper", "scissors", 2) == 3
+        assert damerau_levenshtein_bounded("paper", "scissors", 2) == 3
+        assert weighted_levenshtein_bounded("paper", "scissors", 2) == 3
+
+    def test_transpositions_bounded_damerau(self):
+        # three transpositions, the bound must not cut any of them off
+        assert damerau_levenshtein_bounded("abcdef", "badcfe", 3) == 3
+        assert damerau_levenshtein_bounded("abcdef", "badcfe", 2) == 3
@@ -0,0 +1,89 @@
+# Author: agent
+# Date: October 19, 2026
+# Python 3.11
+# Linux
+
+import unicodedata
+
+
+class NormalizationError(Exception):
+    def __init__(self, msg):
+        super().__init__(msg)
+
+
+class Normalizer:
+    """
+    Configurable normalization of words to keys that are inserted into the
+    BKTree and searched for instead of the raw strings. Words only differing
+    in their Unicode representation (e.g. NFC vs. NFD), in case (e.g.
+    'Straße' vs. 'STRASSE') or in accents (e.g. 'café' vs. 'cafe') can be
+    mapped to the same key and thus become a single node.
+    """
+
+    forms = ("NFC", "NFKC", "NFD", "NFKD")
+
+    def __init__(self, form="NFC", casefold=False, strip_accents=False):
+        """
+        Instantiates a Normalizer with the given normalization steps.
+        @param form: Unicode normalization form (NFC, NFKC, NFD or NFKD),
+        as str. It is applied first and restored after every other step.
+        @param casefold: Boolean determining if words are case-folded,
+        i.e. case distinctions (including 'ß' vs. 'ss') are removed.
+        @param strip_accents: Boolean determining if combining marks
+        (accents, diacritics) are removed.
+        """
+        if form not in self.forms:
+            raise NormalizationError(f"Invalid normalization form. "
+                                     f"Available forms: "
+                                     f"{', '.join(self.forms)}.")
+        self.__form = form
+        self.__casefold = casefold
+        self.__strip_accents = strip_accents
+
+    @property
+    def form(self):
+        """
+        Returns the Unicode normalization form of the Normalizer.
+        @return: Normalization form as str.
+        """
+        return self.__form
+
+    @property
+    def casefold(self):
+        """
+        Returns if the Normalizer case-folds words.
+        @return: Boolean.
+        """
+        return self.__casefold
+
+    @property
+    def strip_accents(self):
+        """
+        Returns if the Normalizer removes accents from words.
+        @return: Boolean.
+        """
+        return self.__strip_accents
+
+    def __call__(self, word):
+        """
+        Normalizes a word to its key.
+        @param word: Word as str.
+        @return: Normalized key as str.
+        """
+        key = unicodedata.normalize(self.__form, word)
+        if self.__casefold:
+            # case folding may produce unnormalized strings
+            key = unicodedata.normalize(self.__form, key.casefold())
+        if self.__strip_accents:
+            # decompose to separate the combining marks from the base
+            # characters and drop them
+            key = unicodedata.normalize(
+                self.__form,
+                "".join(char for char in unicodedata.normalize("NFD", key)
+                        if not unicodedata.combining(char)))
+        return key
+
+    def __repr__(self):
+        return f"Normalizer(form={self.__form!r}, " \
+               f"casefold={self.__casefold}, " \
+               f"strip_accents={self.__strip_accents})"
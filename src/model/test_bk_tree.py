@@ -0,0 +1,264 @@
+# Author: agent
+# Date: October 19, 2026
+# Python 3.11
+# Linux
+
+import pickle
+import unicodedata
+import graphviz
+import pytest
+from src.model.bk_tree import BKTree, ListIntegrityError, SearchWordError
+from src.model.normalizer import Normalizer
+from src.model.metrics.metrics import all_metrics
+from src.view.bk_view import BKView
+
+WORDS = ["democracies", "democratic", "democratise", "demodulates",
+         "demographic", "demoiselles", "demolishers", "demolishing",
+         "demonstrate", "demoralises", "demoralizes", "demountable",
+         "demobilised", "demobilises", "demobilizes", "demoticists"]
+
+# with root "book" and levenshtein, the words form the tree
+# book -1-> books -2-> cook -2-> boo -1-> boon
+# book -4-> cart -2-> cape -1-> cake
+# book -5-> cakes
+SHAPE_WORDS = ["book", "books", "boo", "boon", "cook", "cake", "cakes",
+               "cape", "cart"]
+
+
+@pytest.fixture(autouse=True)
+def output_dir(tmp_path, monkeypatch):
+    # BKTree writes .dot/.pkl files to src/model/output
+    (tmp_path / "src" / "model").mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+
+
+def read_dot(path):
+    # node and edge lines of an exported .dot file, in any order
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines[0] == "digraph BKTree {" and lines[-1] == "}"
+    return set(lines[1:-1])
+
+
+class TestBKTree:
+
+    def test_search_below_distant_root(self):
+        # every word but the root is farther than d=0 from the root,
+        # the search must continue below it
+        tree = BKTree(WORDS, "levenshtein")
+        for word in WORDS:
+            assert tree.search(word, 0) == [word]
+
+    def test_search_beyond_root(self):
+        # the root is far from the search word, but a deeper word is close
+        tree = BKTree(WORDS, "levenshtein", root="demographic")
+        assert tree.search("demobilizez", 1) == ["demobilizes"]
+
+    def test_surface_forms(self):
+        words = ["Straße", "STRASSE", "strasse", "Haus"]
+        tree = BKTree(words, "levenshtein",
+                      normalizer=Normalizer(casefold=True))
+        assert tree.num_of_words == 2
+        assert tree.search("STRASSE", 0) == ["Straße", "STRASSE", "strasse"]
+        assert tree.search("haus", 0) == ["Haus"]
+
+    def test_normalized_search_word(self):
+        tree = BKTree([unicodedata.normalize("NFD", "café"), "cafe"],
+                      "levenshtein", normalizer=Normalizer())
+        assert tree.search(unicodedata.normalize("NFC", "café"), 0) \
+            == [unicodedata.normalize("NFD", "café")]
+
+    def test_empty_key(self):
+        with pytest.raises(ListIntegrityError):
+            BKTree(["x", "\u0301"], "levenshtein",
+                   normalizer=Normalizer(strip_accents=True))
+
+    def test_empty_search_word(self):
+        tree = BKTree(["x"], "levenshtein",
+                      normalizer=Normalizer(strip_accents=True))
+        with pytest.raises(SearchWordError):
+            tree.search("\u0301", 1)
+
+    def test_given_root(self):
+        assert BKTree(WORDS, "levenshtein", root="demographic").root \
+            == "demographic"
+
+    def test_invalid_root(self):
+        with pytest.raises(ListIntegrityError):
+            BKTree(WORDS, "levenshtein", root="democrazy")
+
+    def test_rebuild_reuses_cache(self):
+        tree = BKTree(WORDS, "levenshtein", cache=1000, root="demographic")
+        cache = tree.cache
+        hits, misses = cache.hits, cache.misses
+        rebuilt = BKTree(WORDS[1:] + ["demonizes"], "levenshtein",
+                         cache=cache)
+        # the previous root is reused, most insertions are repeated
+        assert rebuilt.root == "demographic"
+        assert cache.hits - hits > cache.misses - misses
+
+    @pytest.mark.parametrize("normalizer", [
+        None, Normalizer(casefold=True, strip_accents=True)])
+    @pytest.mark.parametrize("metric", list(all_metrics))
+    def test_tree_equals_scan(self, metric, normalizer):
+        words = WORDS + ["Démocratic", "DEMONSTRATE", "démodulate"]
+        tree = BKTree(words, metric, normalizer=normalizer)
+        for search_word in ["democratic", "Demolished", "demobilise"]:
+            for d in range(4):
+                # identical results in identical order
+                assert tree.search(search_word, d, path="tree") \
+                       == tree.search(search_word, d, path="scan")
+
+    def test_forced_path_skips_estimate(self):
+        tree = BKTree(WORDS, "levenshtein")
+        tree.search("democratic", 1, path="scan")
+        assert tree.last_plan["path"] == "scan"
+        assert tree.last_plan["estimated_fraction"] is None
+        tree.search("democratic", 1)
+        assert tree.last_plan["estimated_fraction"] is not None
+
+    def test_unpickle_old_tree(self, monkeypatch):
+        tree = BKTree(WORDS, "levenshtein", root="demographic")
+        # state of a tree pickled before caches, normalizers, statistics
+        # and the query planner were added
+        old_state = {key: value for key, value in vars(tree).items()
+                     if key in ("_BKTree__word_list", "_BKTree__dist_func",
+                                "_BKTree__root_word", "_BKTree__tree",
+                                "_BKTree__graph")}
+        old_state["_BKTree__node_depths"] = [0, 1]
+        old_state["_BKTree__tree_depth"] = 1
+        monkeypatch.setattr(BKTree, "__getstate__", lambda self: old_state)
+        old_tree = pickle.loads(pickle.dumps(tree))
+        monkeypatch.undo()
+        assert old_tree.tree_depth == tree.tree_depth
+        assert old_tree.cache is None and old_tree.normalizer is None
+        assert old_tree.search("demobilizez", 1) == ["demobilizes"]
+        assert old_tree.search("demobilizez", 1, path="scan") \
+               == ["demobilizes"]
+        assert not hasattr(old_tree, "_BKTree__node_depths")
+
+    def test_max_visited(self):
+        tree = BKTree(WORDS, "levenshtein")
+        # a search with a large d visits every node, the sampled searches
+        # stop once they exceed the threshold
+        tree.scan_threshold = 0.1
+        assert tree.estimate_visited_fraction(20) \
+               <= (0.1 * len(WORDS) + 1) / len(WORDS)
+        tree.scan_threshold = 1
+        assert tree.estimate_visited_fraction(20) == 1
+
+    def test_scan_threshold(self):
+        tree = BKTree(WORDS, "levenshtein")
+        with pytest.raises(AssertionError):
+            tree.scan_threshold = 1.5
+        tree.scan_threshold = 0
+        tree.search("democratic", 1)
+        assert tree.last_plan["path"] == "scan"
+        # the estimates are sampled again for the new threshold
+        tree.scan_threshold = 1
+        tree.search("democratic", 1)
+        assert tree.last_plan["path"] == "tree"
+        assert tree.last_plan["threshold"] == 1
+
+    def test_estimate_by_word_length(self):
+        tree = BKTree(SHAPE_WORDS, "levenshtein", root="book")
+        # no cap, the estimate is the exact share of visited nodes
+        tree.scan_threshold = 1
+        # "boo" is the only word of length 2-3, searching it with d=0
+        # visits book, books, cook and boo
+        assert tree.estimate_visited_fraction(0, 3) == pytest.approx(4 / 9)
+        assert tree.estimate_visited_fraction(0, 2) == pytest.approx(4 / 9)
+
+    def test_tree_stats(self):
+        tree = BKTree(SHAPE_WORDS, "levenshtein", root="book")
+        stats = tree.tree_stats
+        assert stats.num_nodes == len(SHAPE_WORDS)
+        assert tree.tree_depth == stats.max_depth == 4
+        assert stats.depth_histogram == {0: 1, 1: 3, 2: 2, 3: 2, 4: 1}
+        assert stats.mean_depth == pytest.approx(17 / 9)
+        assert stats.fan_out_distribution == {0: 3, 1: 5, 3: 1}
+        assert stats.edge_distance_distribution == {1: 3, 2: 3, 4: 1, 5: 1}
+
+    def test_export_max_depth(self, tmp_path):
+        tree = BKTree(SHAPE_WORDS, "levenshtein", root="book")
+        path = str(tmp_path / "top.dot")
+        tree.export_dot(path, max_depth=1)
+        # nodes with cut off children are dashed, leaves are not
+        assert read_dot(path) == {
+            '"book";',
+            '"book" -> "books" [label=1, weight=1];',
+            '"book" -> "cart" [label=4, weight=4];',
+            '"book" -> "cakes" [label=5, weight=5];',
+            '"books" [style=dashed];',
+            '"cart" [style=dashed];'}
+        tree.export_dot(path, max_depth=0)
+        assert read_dot(path) == {'"book";'}
+
+    def test_export_whole_tree(self, tmp_path):
+        tree = BKTree(SHAPE_WORDS, "levenshtein", root="book")
+        path = str(tmp_path / "tree.dot")
+        tree.export_dot(path)
+        lines = read_dot(path)
+        assert len(lines) == len(SHAPE_WORDS)
+        assert '"boo" -> "boon" [label=1, weight=1];' in lines
+        assert not any("dashed" in line for line in lines)
+
+    def test_export_subtree(self, tmp_path):
+        tree = BKTree(SHAPE_WORDS, "levenshtein", root="book",
+                      normalizer=Normalizer(casefold=True))
+        path = str(tmp_path / "cart.dot")
+        # the subtree word is normalized like a search word
+        tree.export_dot(path, subtree_word="CART")
+        assert read_dot(path) == {
+            '"cart";',
+            '"cart" -> "cape" [label=2, weight=2];',
+            '"cape" -> "cake" [label=1, weight=1];'}
+        tree.export_dot(path, max_depth=1, subtree_word="cart")
+        assert read_dot(path) == {
+            '"cart";',
+            '"cart" -> "cape" [label=2, weight=2];',
+            '"cape" [style=dashed];'}
+        with pytest.raises(SearchWordError):
+            tree.export_dot(path, subtree_word="cars")
+
+    def test_export_query(self, tmp_path):
+        tree = BKTree(SHAPE_WORDS, "levenshtein", root="book")
+        path = str(tmp_path / "query.dot")
+        tree.export_dot(path, query=("boon", 0))
+        # only visited nodes with their distance, the result is filled
+        assert read_dot(path) == {
+            '"book" [label="book (1)"];',
+            '"book" -> "books" [label=1, weight=1];',
+            '"books" [label="books (2)"];',
+            '"books" -> "cook" [label=2, weight=2];',
+            '"cook" [label="cook (2)"];',
+            '"cook" -> "boo" [label=2, weight=2];',
+            '"boo" [label="boo (1)"];',
+            '"boo" -> "boon" [label=1, weight=1];',
+            '"boon" [label="boon (0)", style=filled];'}
+        # the distance to the root is only computed up to the largest
+        # child edge + d
+        tree.export_dot(path, query=("xylophone", 0))
+        assert read_dot(path) == {'"book" [label="book (>5)"];'}
+
+    def test_export_quoting(self, tmp_path):
+        tree = BKTree(['say"hi', "back\\slash"], "levenshtein",
+                      root='say"hi')
+        path = str(tmp_path / "quotes.dot")
+        tree.export_dot(path)
+        assert read_dot(path) == {
+            '"say\\"hi";',
+            '"say\\"hi" -> "back\\\\slash" [label=9, weight=9];'}
+
+    def test_render_svg_without_graphviz(self, tmp_path, monkeypatch):
+        tree = BKTree(SHAPE_WORDS, "levenshtein", root="book")
+        path = str(tmp_path / "top.dot")
+        tree.export_dot(path, max_depth=1)
+
+        def render(*args):
+            raise graphviz.ExecutableNotFound(args)
+
+        monkeypatch.setattr(graphviz, "render", render)
+        # only the .dot file is written
+        assert BKView.render_svg(path) is None
+        assert not (tmp_path / "top.dot.svg").exists()
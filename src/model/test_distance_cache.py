@@ -0,0 +1,123 @@
+# Author: agent
+# Date: October 19, 2026
+# Python 3.11
+# Linux
+
+import pickle
+from src.model.distance_cache import DistanceCache
+
+
+class CountingMetric:
+    """
+    Length difference as a simple metric that counts its computations.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def distance(self, word1, word2):
+        self.calls += 1
+        return abs(len(word1) - len(word2))
+
+    def bounded_distance(self, word1, word2, k):
+        return min(self.distance(word1, word2), k + 1)
+
+
+def make_cache(maxsize=10):
+    metric = CountingMetric()
+    cache = DistanceCache(metric.distance, metric.bounded_distance, maxsize)
+    return cache, metric
+
+
+class TestDistanceCache:
+
+    def test_hit(self):
+        cache, metric = make_cache()
+        assert cache.distance("a", "abcd") == 3
+        assert cache.distance("a", "abcd") == 3
+        assert metric.calls == 1
+
+    def test_symmetry(self):
+        cache, metric = make_cache()
+        cache.distance("a", "abcd")
+        assert cache.distance("abcd", "a") == 3
+        assert metric.calls == 1
+        assert cache.size == 1
+
+    def test_exact_entry_answers_bounded_lookup(self):
+        cache, metric = make_cache()
+        cache.distance("a", "abcd")
+        assert cache.distance("a", "abcd", 1) == 2
+        assert cache.distance("a", "abcd", 5) == 3
+        assert metric.calls == 1
+
+    def test_bounded_entry_answers_smaller_or_equal_bound(self):
+        cache, metric = make_cache()
+        # distance 3 exceeds bound 1, only 'greater than 1' is known
+        assert cache.distance("a", "abcd", 1) == 2
+        assert cache.distance("a", "abcd", 1) == 2
+        assert cache.distance("a", "abcd", 0) == 1
+        assert metric.calls == 1
+
+    def test_bounded_entry_misses_larger_bound(self):
+        cache, metric = make_cache()
+        cache.distance("a", "abcd", 1)
+        assert cache.distance("a", "abcd", 2) == 3
+        assert cache.distance("a", "abcd") == 3
+        assert metric.calls == 3
+
+    def test_lru_eviction(self):
+        cache, metric = make_cache(maxsize=2)
+        cache.distance("a", "b")
+        cache.distance("a", "cc")
+        # 'a'/'b' was used most recently, 'a'/'cc' is evicted
+        cache.distance("b", "a")
+        cache.distance("a", "ddd")
+        assert cache.size == 2
+        assert cache.evictions == 1
+        cache.distance("a", "b")
+        assert metric.calls == 3
+        cache.distance("a", "cc")
+        assert metric.calls == 4
+
+    def test_stats(self):
+        cache, _ = make_cache()
+        cache.distance("a", "b")
+        cache.distance("b", "a")
+        cache.distance("a", "b")
+        cache.distance("a", "cc")
+        assert cache.stats == {"size": 2, "maxsize": 10, "hits": 2,
+                               "misses": 2, "evictions": 0,
+                               "hit_rate": 0.5}
+
+    def test_pinned_ids_survive_query_words(self):
+        cache, metric = make_cache(maxsize=1)
+        cache.pin(["tree", "word"])
+        cache.distance("tree", "word")
+        # more unpinned words than could ever be cached
+        for query in ["q", "qq", "qqq", "qqqq"]:
+            cache.intern(query)
+        assert cache.intern("tree") != cache.intern("q")
+        cache.distance("word", "tree")
+        assert metric.calls == 1
+
+    def test_pickle_omits_words(self):
+        cache, metric = make_cache()
+        cache.pin(["apple", "banana"])
+        cache.root = "apple"
+        cache.distance("apple", "cherry")
+        data = pickle.dumps(cache)
+        # neither the distances nor the vocabulary are stored
+        assert b"banana" not in data and b"cherry" not in data
+        cache = pickle.loads(data)
+        assert cache.size == 0 and cache.root is None
+        assert cache.misses == 1
+        assert cache.distance("apple", "banana") == 1
+
+    def test_clear(self):
+        cache, _ = make_cache()
+        cache.root = "a"
+        cache.distance("a", "b")
+        cache.clear()
+        assert cache.size == 0 and cache.hits == 0 and cache.misses == 0
+        assert cache.root is None
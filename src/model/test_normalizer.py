@@ -0,0 +1,46 @@
+# Author: agent
+# Date: October 19, 2026
+# Python 3.11
+# Linux
+
+import unicodedata
+import pytest
+from src.model.normalizer import Normalizer, NormalizationError
+
+CAFE_NFC = unicodedata.normalize("NFC", "café")
+CAFE_NFD = unicodedata.normalize("NFD", "café")
+
+
+class TestNormalizer:
+
+    def test_nfc_nfd(self):
+        assert CAFE_NFC != CAFE_NFD
+        assert Normalizer()(CAFE_NFD) == CAFE_NFC
+
+    def test_nfd(self):
+        assert Normalizer("NFD")(CAFE_NFC) == CAFE_NFD
+
+    def test_nfkc(self):
+        # ligature fi is compatibility-decomposed
+        assert Normalizer("NFKC")("ﬁle") == "file"
+
+    def test_case_preserved(self):
+        assert Normalizer()("Straße") == "Straße"
+
+    def test_casefold(self):
+        normalizer = Normalizer(casefold=True)
+        assert normalizer("Straße") == normalizer("STRASSE") == "strasse"
+
+    def test_strip_accents(self):
+        normalizer = Normalizer(strip_accents=True)
+        assert normalizer(CAFE_NFC) == normalizer(CAFE_NFD) == "cafe"
+
+    def test_strip_accents_keeps_other_letters(self):
+        assert Normalizer(strip_accents=True)("Straße") == "Straße"
+
+    def test_strip_accents_only_combining_mark(self):
+        assert Normalizer(strip_accents=True)("́") == ""
+
+    def test_invalid_form(self):
+        with pytest.raises(NormalizationError):
+            Normalizer("NFX")
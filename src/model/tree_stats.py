@@ -0,0 +1,88 @@
+# Author: agent
+# Date: October 19, 2026
+# Python 3.11
+# Linux
+
+from collections import Counter
+
+
+class TreeStats:
+    """
+    Structural statistics of a BKTree collected in a single iterative pass
+    over its tuple representation: depth histogram, fan-out distribution
+    (number of children per node) and edge distance distribution. Only the
+    counts are kept, i.e. the memory needed does not grow with the
+    vocabulary but with the number of distinct depths/fan-outs/distances.
+    """
+
+    def __init__(self, tree):
+        """
+        Instantiates a TreeStats object by traversing the given tree.
+        @param tree: Tuple representation of the BKTree.
+        """
+        self.__depths = Counter()
+        self.__fan_outs = Counter()
+        self.__edge_distances = Counter()
+
+        # depth-first traversal with an explicit stack of (subtree, depth)
+        stack = [(tree, 0)]
+        while stack:
+            (_, child_dict), depth = stack.pop()
+            self.__depths[depth] += 1
+            self.__fan_outs[len(child_dict)] += 1
+            self.__edge_distances.update(child_dict.keys())
+            stack.extend((child, depth + 1) for child in child_dict.values())
+
+    @property
+    def num_nodes(self):
+        """
+        Returns the number of nodes in the tree.
+        @return: Number of nodes as int.
+        """
+        return sum(self.__depths.values())
+
+    @property
+    def max_depth(self):
+        """
+        Returns the maximum depth of the tree, i.e. the longest path found
+        from the root to a leaf.
+        @return: Maximum tree depth as int.
+        """
+        return max(self.__depths)
+
+    @property
+    def mean_depth(self):
+        """
+        Returns the average depth of all nodes in the tree.
+        @return: Mean node depth as float.
+        """
+        return sum(depth * count for depth, count
+                   in self.__depths.items()) / self.num_nodes
+
+    @property
+    def depth_histogram(self):
+        """
+        Returns the number of nodes on every depth level.
+        @return: Dict of depth (int) and number of nodes (int), sorted by
+        depth.
+        """
+        return dict(sorted(self.__depths.items()))
+
+    @property
+    def fan_out_distribution(self):
+        """
+        Returns how many nodes have a certain number of children.
+        Leaves are counted with a fan-out of 0.
+        @return: Dict of fan-out (int) and number of nodes (int), sorted by
+        fan-out.
+        """
+        return dict(sorted(self.__fan_outs.items()))
+
+    @property
+    def edge_distance_distribution(self):
+        """
+        Returns how many edges are labeled with a certain distance.
+        @return: Dict of distance (int) and number of edges (int), sorted by
+        distance.
+        """
+        return dict(sorted(self.__edge_distances.items()))
@@ -3,6 +3,7 @@
 # Python 3.9
 # Windows 11
 
+import graphviz
 import matplotlib.pyplot as plt
 import networkx as nx
 from networkx.drawing.nx_pydot import graphviz_layout
@@ -26,16 +27,25 @@ class BKView:
         print(notification)
 
     @staticmethod
-    def get_tree_specs(root, num_words, depth):
+    def get_tree_specs(root, num_words, depth, stats=None, visited=None,
+                       threshold=None):
         """
         Presents the following tree specifications to the user:
         root word of the BKTree, the number of its nodes/words, and
         its maximum tree depth, i.e. the longest path found from the root
-        to a leaf.
+        to a leaf. If provided, the tree statistics (depth histogram,
+        fan-out and edge distance distribution) and the estimated share
+        of nodes visited per search distance are presented, too, along
+        with the search path the query planner would choose.
         @param root: Root word of the BKTree instance as str.
         @param num_words: Number of words contained in the BKTree instance,
         as int.
         @param depth: Tree depth of the BKTree instance, as int.
+        @param stats: TreeStats object of the BKTree instance (optional).
+        @param visited: Dict of search distance (int) and estimated share
+        of visited nodes (float) (optional).
+        @param threshold: Scan threshold of the query planner as float,
+        required if visited is given.
         """
         s1 = "Root Word"
         s2 = "Number of Words"
@@ -44,13 +54,44 @@ class BKView:
         out_list = [
             "\n", "-" * 35, "Burkhard Keller Tree Specifications",
             "-" * 35, f"{s1:20}: {root}",
-            f"{s2:20}: {num_words}", f"{s3:20}: {depth}",
-            "\n"
+            f"{s2:20}: {num_words}", f"{s3:20}: {depth}"
         ]
+        if stats is not None:
+            s4 = "Mean Node Depth"
+            s5 = "Depth Histogram"
+            s6 = "Fan-Out"
+            s7 = "Edge Distances"
+            out_list += [
+                f"{s4:20}: {stats.mean_depth:.2f}",
+                f"{s5:20}: {BKView.__format_counts(stats.depth_histogram)}",
+                f"{s6:20}: "
+                f"{BKView.__format_counts(stats.fan_out_distribution)}",
+                f"{s7:20}: "
+                f"{BKView.__format_counts(stats.edge_distance_distribution)}"
+            ]
+        if visited is not None:
+            s8 = "Est. Visited Nodes"
+            # estimates are sampled with searches stopped at the
+            # threshold, i.e. they are only accurate up to it
+            out_list.append(f"{s8:20}: " + ", ".join(
+                f"d={d}: >{threshold:.1%} (scan)" if fraction > threshold
+                else f"d={d}: {fraction:.1%} (tree)"
+                for d, fraction in visited.items()))
+        out_list.append("\n")
         # join all strings together for output in terminal
         # strings are evenly aligned
         print("\n".join(out_list))
 
+    @staticmethod
+    def __format_counts(counts):
+        """
+        Formats a distribution as a compact string of value:count pairs.
+        @param counts: Dict of value (int) and count (int).
+        @return: Formatted distribution as str.
+        """
+        return ", ".join(f"{value}:{count}" for value, count
+                         in counts.items())
+
     @staticmethod
     def visualize(graph):
         """
@@ -90,6 +131,28 @@ class BKView:
         plt.gcf().set_dpi(200)
         plt.show(block=False)
 
+    @staticmethod
+    def render_svg(dot_path):
+        """
+        Renders an exported (part of a) BkTree from a .dot file to an .svg
+        file next to it, using the graphviz 'dot' layout. Unlike visualize,
+        no networkx graph is needed, hence it is suited for the export of
+        large trees limited to a few levels or a search neighbourhood.
+        @param dot_path: Path to the .dot file as str.
+        @return: Path to the .svg file as str or None if the graphviz
+        executables are not available.
+        """
+        print("The BKTree export is being rendered to SVG. Depending on "
+              "the export size, this may take a few moments.\n")
+        try:
+            svg_path = graphviz.render("dot", "svg", dot_path)
+        except graphviz.ExecutableNotFound:
+            print(f"Graphviz 'dot' was not found in path, only the .dot "
+                  f"file was written: {dot_path}\n")
+            return None
+        print(f"SVG saved: {svg_path}\n")
+        return svg_path
+
     @staticmethod
     def get_query_word():
         """